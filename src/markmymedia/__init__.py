@@ -11,7 +11,7 @@ __version__ = "1.1.0"
 from .mark_audio import mark_audio
 from .mark_image import mark_image
 from .mark_video import mark_video
-from .io import gather_files, categorize, construct_output_path
+from .io import gather_files, categorize, construct_output_path, batch_probe
 from .errors import MarkerError
 
 __all__ = [
@@ -22,6 +22,7 @@ __all__ = [
     "gather_files",
     "categorize",
     "construct_output_path",
+    "batch_probe",
     "MarkerError",
     "__version__",
 ]
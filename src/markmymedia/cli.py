@@ -1,26 +1,53 @@
 import argparse
+import itertools
 import os
+import queue
 import sys
+import threading
 import time
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from collections import defaultdict
 
 from . import check_ffmpeg_available, mark_image, mark_audio, mark_video
 from . import __version__
 from .errors import InputFileNotFoundError, MarkerError
-from .io import gather_files, categorize, construct_output_path
+from .io import gather_files, categorize, construct_output_path, batch_probe
 
 
 DEFAULT_OUTPUT = "markered_modals"
 
+# Sentinel pushed through the work queue to tell workers the reader is done.
+_QUEUE_END = object()
 
-def print_progress(mod_label, processed_count, total_count):
-    progress_message = f"⚙️  Processing {mod_label}: {processed_count}/{total_count}"
+_MODALITY_LABELS = {"photo": "photos", "audio": "audio files", "video": "videos"}
+
+
+def print_progress(counts, totals):
+    parts = [
+        f"{_MODALITY_LABELS[mod]} {counts.get(mod, 0)}/{total}"
+        for mod, total in totals.items()
+        if total
+    ]
+    progress_message = "⚙️  Processing " + " | ".join(parts)
     print(progress_message, end="\r", flush=True)
     return progress_message
 
 
+def _pin_to_cpu(index: int):
+    """
+    Pin the calling thread to a single core, round-robin by worker index
+    (Linux only; a no-op elsewhere). Subprocesses inherit the affinity of
+    the thread that spawns them, so each worker's ffmpeg runs stay on the
+    same core instead of migrating between them.
+    """
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {index % (os.cpu_count() or 1)})
+        except OSError:
+            pass
+
+
 def ensure_output_dir(base_output: Path):
     """
     Ensure the output base directory exists.
@@ -29,7 +56,11 @@ def ensure_output_dir(base_output: Path):
     return base_output
 
 
-def process_photo(path: Path, output_base: Path, preserve_structure: bool):
+def process_photo(path, output_base, preserve_structure: bool):
+    # Runs in a worker process: paths arrive as plain strings so the task
+    # arguments pickle cheaply.
+    path = Path(path)
+    output_base = Path(output_base)
     out_path = construct_output_path(path, output_base, "photo", preserve_structure)
     try:
         mark_image(str(path), str(out_path))
@@ -37,37 +68,63 @@ def process_photo(path: Path, output_base: Path, preserve_structure: bool):
         error = None
     except MarkerError as e:
         success = False
-        error = e
+        # The result crosses the process boundary; some MarkerError
+        # subclasses take multi-arg constructors and do not survive a pickle
+        # round-trip, and one unpicklable result breaks the whole pool. The
+        # summary only prints the error, so ship the message.
+        error = str(e)
     return ("photo", path, out_path, success, error)
 
 
-def process_audio(path: Path, output_base: Path, preserve_structure: bool):
+def process_audio(path, output_base, preserve_structure: bool, ffmpeg_threads: int = None):
+    path = Path(path)
+    output_base = Path(output_base)
     out_path = construct_output_path(path, output_base, "audio", preserve_structure)
     try:
-        mark_audio(str(path), str(out_path))
+        mark_audio(str(path), str(out_path), threads=ffmpeg_threads)
         success = True
         error = None
     except MarkerError as e:
         success = False
-        error = e
+        error = str(e)
     return ("audio", path, out_path, success, error)
 
 
-def process_video(path: Path, output_base: Path, preserve_structure: bool):
+def process_video(
+    path, output_base, preserve_structure: bool, ffmpeg_threads: int = None, probe: dict = None
+):
+    path = Path(path)
+    output_base = Path(output_base)
     out_path = construct_output_path(path, output_base, "video", preserve_structure)
     try:
-        mark_video(str(path), str(out_path))
+        mark_video(str(path), str(out_path), threads=ffmpeg_threads, probe=probe)
         success = True
         error = None
     except MarkerError as e:
         success = False
-        error = e
+        error = str(e)
     return ("video", path, out_path, success, error)
 
 
-def run_pipeline(all_files, output_base: Path, jobs: int, preserve_structure: bool):
+def run_pipeline(
+    all_files,
+    output_base: Path,
+    jobs: int,
+    preserve_structure: bool,
+    photo_jobs: int = None,
+    av_jobs: int = None,
+    pin_cpus: bool = False,
+):
     """
-    Execute processing in order: photos -> audio -> video, each with thread pooling.
+    Execute processing as a bounded-queue pipeline: a reader thread feeds the
+    work queue, a pool of workers marks files, and a collector thread drains
+    results, so modalities overlap instead of running as serial stages.
+    Photos are delegated to a process pool (Pillow work is CPU-bound and
+    GIL-held); audio and video run on the worker threads since they just
+    wait on ffmpeg subprocesses.
+    `photo_jobs` and `av_jobs` size the two pools independently (both default
+    to `jobs`); ffmpeg's own threading is scaled down as av_jobs grows so the
+    cores are saturated by parallel files, not by competing ffmpeg processes.
     Returns collected results.
     """
     summary = []
@@ -75,40 +132,123 @@ def run_pipeline(all_files, output_base: Path, jobs: int, preserve_structure: bo
     buckets = categorize(all_files)
 
     modality_order = [
-        ("photo", "photos", process_photo),
-        ("audio", "audio files", process_audio),
-        ("video", "videos", process_video),
+        ("photo", process_photo),
+        ("audio", process_audio),
+        ("video", process_video),
     ]
-
-    for mod_name, mod_label, processor in modality_order:
-        items = buckets.get(mod_name, [])
-        if not items:
-            continue
-
-        total_count = len(items)
-        processed_count = 0
-        stage_start_time = time.perf_counter()
-
-        # Thread pool per modality
-        with ThreadPoolExecutor(max_workers=jobs) as exe:
-            futures = {
-                exe.submit(processor, f, output_base, preserve_structure): f
-                for f in items
-            }
-            print_progress(mod_label, 0, total_count)
-
-            for future in as_completed(futures):
-                processed_count += 1
-                progress_message = print_progress(
-                    mod_label, processed_count, total_count
-                )
-
-                res = future.result()
+    total_count = sum(len(buckets.get(mod, [])) for mod, _ in modality_order)
+
+    photo_jobs = photo_jobs or jobs
+    av_jobs = av_jobs or jobs
+    ffmpeg_threads = max(1, (os.cpu_count() or 4) // av_jobs)
+
+    if total_count:
+        def _size_or_zero(p):
+            try:
+                return p.stat().st_size
+            except OSError:
+                return 0
+
+        # Largest files first (LPT scheduling): a big straggler dispatched
+        # last would extend the whole run while other workers sit idle, so
+        # start the long tasks early and let short ones fill the tail.
+        # sort() evaluates the key once per item, so each file is stat'd once.
+        for mod_name, _ in modality_order:
+            buckets.get(mod_name, []).sort(key=_size_or_zero, reverse=True)
+
+        # Worker threads are cheap waiters: photo workers block on the process
+        # pool and AV workers block on ffmpeg, so run enough threads to keep
+        # both pools fed and cap concurrent ffmpeg runs with a semaphore.
+        worker_count = photo_jobs + av_jobs
+        av_gate = threading.Semaphore(av_jobs)
+
+        # Bounded queues give back-pressure: the reader never races far ahead
+        # of the workers, and the workers never outrun the collector.
+        work_q = queue.Queue(maxsize=2 * worker_count)
+        write_q = queue.Queue(maxsize=2 * worker_count)
+        # modality -> [first dispatch, last completion] timestamps
+        spans = {}
+        probes = {}
+
+        def reader():
+            for mod_name, processor in modality_order:
+                if mod_name == "video":
+                    # Prefetch: fork all ffprobe calls in parallel (while the
+                    # earlier modalities are still being worked on) instead of
+                    # one serial probe inside each mark_video call.
+                    probes.update(batch_probe(buckets.get("video", []), jobs=av_jobs))
+                for f in buckets.get(mod_name, []):
+                    work_q.put((mod_name, processor, f))
+            work_q.put(_QUEUE_END)
+
+        cpu_indices = itertools.count()
+
+        def worker(photo_exe):
+            if pin_cpus:
+                _pin_to_cpu(next(cpu_indices))
+            while True:
+                item = work_q.get()
+                if item is _QUEUE_END:
+                    work_q.put(_QUEUE_END)  # propagate to the next worker
+                    return
+                mod_name, processor, f = item
+                started = time.perf_counter()
+                if mod_name == "photo":
+                    # CPU-bound: hand off to the process pool and wait here.
+                    res = photo_exe.submit(
+                        processor, str(f), str(output_base), preserve_structure
+                    ).result()
+                elif mod_name == "video":
+                    with av_gate:
+                        res = processor(
+                            str(f), str(output_base), preserve_structure,
+                            ffmpeg_threads, probes.get(f),
+                        )
+                else:
+                    with av_gate:
+                        res = processor(
+                            str(f), str(output_base), preserve_structure, ffmpeg_threads
+                        )
+                write_q.put((res, started, time.perf_counter()))
+
+        totals = {mod: len(buckets.get(mod, [])) for mod, _ in modality_order}
+        counts = defaultdict(int)
+
+        def collector():
+            progress_message = print_progress(counts, totals)
+            last_print = 0.0
+            for processed_count in range(1, total_count + 1):
+                res, started, finished = write_q.get()
                 summary.append(res)
-            stage_duration = time.perf_counter() - stage_start_time
-            timings[mod_name] = stage_duration
-        print(" " * (len(progress_message) + 5), end="\r")
-        print(f"✅ Finished processing {total_count} {mod_label}.")
+                counts[res[0]] += 1
+                span = spans.setdefault(res[0], [started, finished])
+                span[0] = min(span[0], started)
+                span[1] = max(span[1], finished)
+                # Throttle to ~20 Hz: every update is a write syscall plus a
+                # flush, which becomes a real cost across thousands of small
+                # files. The final count is always printed.
+                now = time.monotonic()
+                if now - last_print > 0.05 or processed_count == total_count:
+                    progress_message = print_progress(counts, totals)
+                    last_print = now
+            print(" " * (len(progress_message) + 5), end="\r")
+            print(f"✅ Finished processing {total_count} media files.")
+
+        reader_t = threading.Thread(target=reader, daemon=True)
+        collector_t = threading.Thread(target=collector, daemon=True)
+        with ProcessPoolExecutor(max_workers=photo_jobs) as photo_exe, ThreadPoolExecutor(
+            max_workers=worker_count
+        ) as exe:
+            reader_t.start()
+            collector_t.start()
+            workers = [exe.submit(worker, photo_exe) for _ in range(worker_count)]
+            for w in workers:
+                w.result()  # surface unexpected worker failures
+            reader_t.join()
+            collector_t.join()
+
+        for mod_name, (first_start, last_end) in spans.items():
+            timings[mod_name] = last_end - first_start
 
     if buckets.get("unknown"):
         print(f"⚠️ Skipped {len(buckets['unknown'])} unknown file types.")
@@ -178,6 +318,29 @@ def parse_args():
         default=os.cpu_count() or 4,
         help="Number of worker threads to use per modality (default: number of CPUs).",
     )
+    parser.add_argument(
+        "--photo-jobs",
+        type=int,
+        default=None,
+        help="Worker processes for the photo stage (default: --jobs).",
+    )
+    parser.add_argument(
+        "--av-jobs",
+        type=int,
+        default=None,
+        help=(
+            "Concurrent ffmpeg runs for audio/video (default: --jobs). "
+            "Each ffmpeg is limited to cpu_count // av-jobs internal threads."
+        ),
+    )
+    parser.add_argument(
+        "--pin-cpus",
+        action="store_true",
+        help=(
+            "Pin each worker thread (and the ffmpeg processes it spawns) to a "
+            "single CPU core for cache locality. Linux only; ignored elsewhere."
+        ),
+    )
     parser.add_argument(
         "-p",
         "--preserve-structure",
@@ -219,6 +382,9 @@ def main():
         output_base,
         jobs=args.jobs,
         preserve_structure=args.preserve_structure,
+        photo_jobs=args.photo_jobs,
+        av_jobs=args.av_jobs,
+        pin_cpus=args.pin_cpus,
     )
     total_elapsed = time.perf_counter() - start_total
 
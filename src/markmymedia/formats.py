@@ -5,4 +5,11 @@ Defines supported media formats and extensions for the MarkMyMedia library.
 # Supported extensions per modality
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tiff", ".tif", ".webp"}
 AUDIO_EXTS = {".mp3", ".flac", ".aac", ".m4a", ".ogg", ".opus"}
-VIDEO_EXTS = {".mp4", ".mov", ".avi", ".mkv", ".webm", ".mpg", ".mpeg"}
\ No newline at end of file
+VIDEO_EXTS = {".mp4", ".mov", ".avi", ".mkv", ".webm", ".mpg", ".mpeg"}
+
+# Flat extension -> modality map, so categorization is a single dict lookup
+EXT_TO_MODALITY = (
+    {e: "photo" for e in IMAGE_EXTS}
+    | {e: "audio" for e in AUDIO_EXTS}
+    | {e: "video" for e in VIDEO_EXTS}
+)
\ No newline at end of file
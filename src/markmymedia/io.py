@@ -1,9 +1,19 @@
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Literal
 
-from .errors import InputFileNotFoundError
-from .formats import IMAGE_EXTS, AUDIO_EXTS, VIDEO_EXTS
+from .errors import FFmpegProcessError, InputFileNotFoundError
+from .formats import EXT_TO_MODALITY
+from .utils import _ffprobe_param
+
+# Directories already created by construct_output_path. It is called from
+# several worker threads at once, hence the lock; the photo worker processes
+# each keep their own copy, which merely costs a few duplicate mkdir calls.
+_created_dirs: set = set()
+_created_dirs_lock = threading.Lock()
 
 
 def gather_files(
@@ -20,30 +30,52 @@ def gather_files(
         output_dir (Path): The base output directory, which will be excluded from the search.
 
     Returns:
-        List[Path]: A list of resolved, absolute file paths.
+        List[Path]: A list of absolute file paths.
 
     Raises:
         InputFileNotFoundError: If a path in `paths` does not exist.
     """
     result: List[Path] = []
-    resolved_exclude_path = output_dir.resolve()
+    exclude_path = os.path.realpath(output_dir)
 
     if not paths:
         paths = [Path(".")]
 
     for p in paths:
         p = Path(p)
-        if p.resolve() == resolved_exclude_path:
+        root = os.path.realpath(p)
+        if root == exclude_path:
             continue
         if p.is_file():
-            result.append(p.resolve())
+            result.append(Path(root))
         elif p.is_dir():
-            glob_pattern = "**/*" if recursive else "*"
-            for f in p.glob(glob_pattern):
-                if f.is_file():
-                    result.append(f.resolve())
+            # Walk with os.scandir instead of Path.glob: DirEntry reuses the
+            # stat from the directory listing, and only the roots get the
+            # full realpath treatment instead of every single file.
+            stack = [root]
+            while stack:
+                try:
+                    entries = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                with entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                # Skip hidden directories early; hidden files
+                                # are still collected, as before.
+                                if (
+                                    recursive
+                                    and not entry.name.startswith(".")
+                                    and os.path.realpath(entry.path) != exclude_path
+                                ):
+                                    stack.append(entry.path)
+                            elif entry.is_file():
+                                result.append(Path(entry.path))
+                        except OSError:
+                            continue
         else:
-            raise InputFileNotFoundError(str(p))                
+            raise InputFileNotFoundError(str(p))
     return result
 
 
@@ -64,19 +96,45 @@ def categorize(files: List[Path]) -> Dict[str, List[Path]]:
         "video": [],
         "unknown": [],
     }
+    # Hoist lookups out of the loop; one dict probe per file instead of up
+    # to three set membership tests.
+    get_modality = EXT_TO_MODALITY.get
+    appenders = {mod: bucket.append for mod, bucket in buckets.items()}
     for f in files:
-        ext = f.suffix.lower()
-        if ext in IMAGE_EXTS:
-            buckets["photo"].append(f)
-        elif ext in AUDIO_EXTS:
-            buckets["audio"].append(f)
-        elif ext in VIDEO_EXTS:
-            buckets["video"].append(f)
-        else:
-            buckets["unknown"].append(f)
+        appenders[get_modality(f.suffix.lower(), "unknown")](f)
     return buckets
 
 
+def batch_probe(paths: List[Path], jobs: int = None) -> Dict[Path, dict]:
+    """
+    Probe many video files with ffprobe concurrently.
+
+    Each probe is a subprocess fork; running them serially puts N forks on
+    the critical path of the video stage, so they are issued through a
+    thread pool up front instead.
+
+    Args:
+        paths (List[Path]): Video files to probe.
+        jobs (int, optional): Worker threads to use. Defaults to the CPU count.
+
+    Returns:
+        Dict[Path, dict]: Parsed ffprobe data per file. Files whose probe
+                          failed are omitted so callers can probe (and
+                          report) them individually.
+    """
+    if not paths:
+        return {}
+    results: Dict[Path, dict] = {}
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 4) as exe:
+        futures = {exe.submit(_ffprobe_param, str(p)): p for p in paths}
+        for future, p in futures.items():
+            try:
+                results[p] = future.result()
+            except (OSError, FFmpegProcessError):
+                pass
+    return results
+
+
 def construct_output_path(
     input_path: Path,
     output_base: Path,
@@ -104,16 +162,27 @@ def construct_output_path(
 
     if preserve_structure:
         base = source_base or Path.cwd()
-        try:
-            relative_dir = input_path.parent.relative_to(base)
-            target_dir = output_base / relative_dir
-        except ValueError:
-            # Fallback if input_path is not under base, place it in the root
+        # Plain string prefix strip instead of Path.relative_to: no parts
+        # tuple allocation, and inputs outside the base fall through without
+        # raising/catching ValueError on every such file.
+        base_str = str(base)
+        if not base_str.endswith(os.sep):
+            base_str += os.sep
+        parent_str = str(input_path.parent)
+        if parent_str.startswith(base_str):
+            target_dir = output_base / parent_str[len(base_str):]
+        else:
+            # input_path is not under base (or is base itself); place it in the root
             target_dir = output_base
     else:
         target_dir = output_base
 
-    target_dir.mkdir(parents=True, exist_ok=True)
+    # mkdir is a syscall per file even when the directory exists; remember
+    # what was already created and skip the repeats.
+    with _created_dirs_lock:
+        if target_dir not in _created_dirs:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            _created_dirs.add(target_dir)
 
     if modality == "photo":
         out_name = f"{stem}_marked{ext}"
@@ -1,5 +1,4 @@
 import os
-import subprocess
 from typing import Tuple
 from pathlib import Path
 
@@ -15,7 +14,25 @@ from .errors import (
     FileError,
 )
 from .formats import AUDIO_EXTS
-from .utils import _generate_lavfi_drawtext
+from .utils import _generate_lavfi_drawtext, _run_ffmpeg
+
+# Static ffmpeg argument template, built once at import; the per-call slots
+# (lavfi source and input path) are filled in by index and the output path is
+# appended last. Avoids rebuilding ~20 literals per file in batch runs.
+_FFMPEG_AUDIO_TEMPLATE = (
+    "ffmpeg", "-y",
+    "-f", "lavfi", "-i", None,
+    "-i", None,
+    "-framerate", "1",
+    "-map", "0:v:0",
+    "-map", "1:a:0",
+    "-c:v", "libx264",
+    "-crf", "20",
+    "-pix_fmt", "yuv420p",
+    "-c:a", "copy",
+)
+_LAVFI_SLOT = 5
+_INPUT_SLOT = 7
 
 
 def mark_audio(
@@ -23,6 +40,7 @@ def mark_audio(
     output_path: str = None,
     resolution: Tuple[int, int] = (1280, 256),
     overlay_text: str = None,
+    threads: int = None,
 ) -> None:
     """
     Overlay file name text on a black background and combine with audio to produce a video.
@@ -31,6 +49,8 @@ def mark_audio(
         input_path (str): Path to the input audio file.
         output_path (str, optional): Output video path. Must have a .mp4 extension.
         resolution (tuple): Video resolution (width, height).
+        threads (int, optional): Cap on ffmpeg's internal thread count. Useful
+                                 when many files are processed in parallel.
 
     Raises:
         InputFileNotFoundError: If the input file does not exist.
@@ -66,32 +86,18 @@ def mark_audio(
     if overlay_text is None:
         overlay_text = "Filename: " + os.path.basename(input_path)
     lavfi_source = _generate_lavfi_drawtext(overlay_text, resolution)
-    
-    ffmpeg_cmd = [
-        "ffmpeg", "-y",
-        "-f", "lavfi", "-i", lavfi_source,
-        "-i", input_path,
-        "-framerate", "1",
-        "-map", "0:v:0",
-        "-map", "1:a:0",
-        "-c:v", "libx264",
-        "-crf", "20",
-        "-pix_fmt", "yuv420p",
-        "-c:a", "copy",
-        str(output_p)
-    ]
+
+    ffmpeg_cmd = list(_FFMPEG_AUDIO_TEMPLATE)
+    ffmpeg_cmd[_LAVFI_SLOT] = lavfi_source
+    ffmpeg_cmd[_INPUT_SLOT] = input_path
+    if threads:
+        ffmpeg_cmd += ["-threads", str(threads)]
+    ffmpeg_cmd.append(str(output_p))
 
     try:
-        subprocess.run(
-            ffmpeg_cmd, 
-            check=True, 
-            stdout=subprocess.DEVNULL, 
-            stderr=subprocess.STDOUT
-        )
+        _run_ffmpeg(ffmpeg_cmd)
     except FileNotFoundError:
         raise FFmpegNotFoundError()
-    except subprocess.CalledProcessError as e:
-        raise FFmpegProcessError(command=ffmpeg_cmd, stderr=e.stderr) from e
     except Exception as e:
         if isinstance(e, MarkerError):
             raise
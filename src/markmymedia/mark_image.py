@@ -1,3 +1,5 @@
+import functools
+import html
 import os
 from pathlib import Path
 
@@ -13,6 +15,32 @@ from .errors import (
 from .formats import IMAGE_EXTS
 from PIL import Image, ImageDraw, ImageFont
 
+try:
+    # Optional accelerated backend: libvips decodes/encodes with internal
+    # threading and streams large images tile by tile instead of holding the
+    # whole decoded frame in memory.
+    import pyvips
+except ImportError:
+    pyvips = None
+
+
+@functools.lru_cache(maxsize=64)
+def _font_metrics(font_size: int):
+    """
+    Load the overlay font for a given size and precompute its average
+    character width, reusing both across images.
+    """
+    try:
+        # Attempt to load a common, high-quality font
+        font = ImageFont.truetype("DejaVuSans.ttf", size=font_size)
+    except IOError:
+        # Fallback to Pillow's default font if not found
+        font = ImageFont.load_default()
+    # getlength is a FreeType query per call; measure once per font size.
+    avg_char_width = font.getlength("abcdefghijklmnopqrstuvwxyz") / 26
+    return font, avg_char_width
+
+
 def mark_image(
     input_path: str,
     output_path: str = None,
@@ -25,6 +53,10 @@ def mark_image(
     ensuring a consistent look across different resolutions. A semi-transparent
     background is drawn behind the text for readability.
 
+    Uses libvips (via the optional `pyvips` package) when available, which is
+    internally threaded and streams tiles instead of decoding whole images;
+    otherwise falls back to Pillow.
+
     Args:
         input_path (str): Path to the input image file.
         output_path (str, optional): Output path. Defaults to a modified name
@@ -63,47 +95,102 @@ def mark_image(
             str(output_p), f"Could not create parent directory: {e}"
         ) from e
 
-    try:
-        img = Image.open(input_path)
-        
-        # Convert to RGBA for drawing with transparency, create draw object
-        draw = ImageDraw.Draw(img, "RGB")
-        width, height = img.size
-        
-        # Calculate a font size proportional to the image height
-        font_size = max(10, int(height / 30))
-        
-        try:
-            # Attempt to load a common, high-quality font
-            font = ImageFont.truetype("DejaVuSans.ttf", size=font_size)
-        except IOError:
-            # Fallback to Pillow's default font if not found
-            font = ImageFont.load_default()
-        
-        if overlay_text is None:
-            overlay_text = "Filename: " + os.path.basename(input_path) 
-        
-        avg_char_width = font.getlength("abcdefghijklmnopqrstuvwxyz") / 26
-        margin = int(width * 0.05)
-        max_chars = int((width - 2 * margin) / avg_char_width) if avg_char_width > 0 else 20
-        wrapped_text = _wrap_text(overlay_text, max_chars)
-
-        # Position for the text block
-        margin = int(font_size * 0.4)
-        text_pos = (margin, margin)
-        
-        draw.text(
-            text_pos, 
-            wrapped_text, 
-            font=font, 
-            fill="white", 
-            stroke_width=3,
-            stroke_fill="black"
-        )
-
-        img.save(str(output_p))
+    if overlay_text is None:
+        overlay_text = "Filename: " + os.path.basename(input_path)
 
+    try:
+        if pyvips is not None:
+            try:
+                _mark_with_vips(input_path, output_p, overlay_text)
+            except pyvips.Error:
+                # Common libvips builds cannot write every extension we
+                # support (.bmp always, .gif without cgif/magick); redo the
+                # file with Pillow rather than failing it.
+                _mark_with_pillow(input_path, output_p, overlay_text)
+        else:
+            _mark_with_pillow(input_path, output_p, overlay_text)
     except Exception as e:
         if isinstance(e, MarkerError):
             raise
-        raise ImageMarkingError(f"An unexpected error occurred during image processing: {e}") from e
\ No newline at end of file
+        raise ImageMarkingError(f"An unexpected error occurred during image processing: {e}") from e
+
+
+def _mark_with_pillow(input_path: str, output_p: Path, overlay_text: str) -> None:
+    img = Image.open(input_path)
+
+    # Fast-path JPEG decode: draft() lets libjpeg pick its fast IDCT,
+    # which is plenty for an image that only gets an overlay stamped on.
+    if img.format == "JPEG":
+        img.draft("RGB", img.size)
+
+    # Normalize the mode once up front: drawing on P/L/CMYK images would
+    # otherwise make Pillow allocate a conversion buffer for the draw, and
+    # saving to formats like JPEG would convert the whole image again.
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGB")
+    draw = ImageDraw.Draw(img)
+    width, height = img.size
+
+    # Calculate a font size proportional to the image height
+    font_size = max(10, int(height / 30))
+
+    font, avg_char_width = _font_metrics(font_size)
+
+    margin = int(width * 0.05)
+    max_chars = int((width - 2 * margin) / avg_char_width) if avg_char_width > 0 else 20
+    wrapped_text = _wrap_text(overlay_text, max_chars)
+
+    # Position for the text block
+    margin = int(font_size * 0.4)
+    text_pos = (margin, margin)
+
+    draw.text(
+        text_pos,
+        wrapped_text,
+        font=font,
+        fill="white",
+        stroke_width=3,
+        stroke_fill="black"
+    )
+
+    save_kwargs = {}
+    if output_p.suffix.lower() in (".jpg", ".jpeg"):
+        # Explicitly skip the slow encode paths (optimize/progressive).
+        save_kwargs = {"quality": 90, "optimize": False, "progressive": False}
+    img.save(str(output_p), **save_kwargs)
+
+
+def _mark_with_vips(input_path: str, output_p: Path, overlay_text: str) -> None:
+    # Sequential access lets vips stream tiles from the decoder instead of
+    # materializing the whole image.
+    img = pyvips.Image.new_from_file(str(input_path), access="sequential")
+
+    # Same proportions as the Pillow path
+    font_size = max(10, img.height // 30)
+    margin = int(font_size * 0.4)
+
+    # vips wraps the text itself given a pixel width; dpi=72 makes one point
+    # equal one pixel, matching the Pillow font sizing. text() parses Pango
+    # markup, so escape &, <, > or filenames containing them fail to render.
+    escaped_text = html.escape(overlay_text, quote=False)
+    mask = pyvips.Image.text(
+        escaped_text,
+        font=f"DejaVu Sans {font_size}",
+        width=max(1, img.width - 2 * margin),
+        dpi=72,
+    )
+
+    # White glyphs with the mask as alpha, over a semi-transparent black box
+    # (the same style the lavfi drawtext markers use for audio/video).
+    text_rgba = mask.new_from_image([255, 255, 255]).bandjoin(mask).copy(interpretation="srgb")
+    box = text_rgba.new_from_image([0, 0, 0, 176])
+    pad = margin // 2
+    box = box.embed(pad, pad, box.width + 2 * pad, box.height + 2 * pad, extend="copy")
+    overlay = box.composite2(text_rgba, "over", x=pad, y=pad)
+
+    marked = img.composite2(overlay, "over", x=margin, y=margin)
+
+    if output_p.suffix.lower() in (".jpg", ".jpeg"):
+        marked.write_to_file(str(output_p), Q=90)
+    else:
+        marked.write_to_file(str(output_p))
\ No newline at end of file
@@ -1,4 +1,3 @@
-import subprocess
 import os
 from typing import Tuple
 import tempfile
@@ -19,13 +18,92 @@ from .errors import (
     FileError,
 )
 from .formats import VIDEO_EXTS
-from .utils import _ffprobe_param, _generate_lavfi_drawtext
+from .utils import (
+    _available_encoders,
+    _ffprobe_param,
+    _generate_lavfi_drawtext,
+    _run_ffmpeg,
+)
+
+# Hardware encoders in preference order per codec. The marker is only half a
+# second long, so software-encoder startup dominates its cost; a fixed-function
+# block encodes it almost for free and leaves the CPU to other files.
+_HW_ENCODERS = {
+    "h264": ("h264_nvenc", "h264_videotoolbox"),
+    "hevc": ("hevc_nvenc", "hevc_videotoolbox"),
+}
+_SW_ENCODERS = {"h264": "libx264", "hevc": "libx265"}
+
+# Encoders that ffmpeg lists but that failed at runtime on this machine.
+# `-encoders` only reports what is compiled in: a stock build happily lists
+# h264_nvenc on a box with no NVIDIA driver, and the encode then fails with
+# "Cannot load libcuda". Remember such failures so later files skip straight
+# to the software encoder.
+_broken_encoders: set = set()
+
+
+def _select_encoder(codec: str) -> str:
+    """Pick a hardware encoder for the marker when the local ffmpeg has one."""
+    available = _available_encoders()
+    for encoder in _HW_ENCODERS.get(codec, ()):
+        if encoder in available and encoder not in _broken_encoders:
+            return encoder
+    return _SW_ENCODERS[codec]
+
+
+def _concat_via_mpegts(input_path, marker_path, output_path, video_codec, thread_args):
+    """
+    Fallback concat through MPEG-TS intermediates. Costs a full extra
+    write/read of the source, so it only runs when the direct mp4 concat
+    of marker + original is rejected by ffmpeg.
+    """
+    tmp = tempfile.gettempdir()
+    uid = uuid.uuid4().hex
+    marker_ts = os.path.join(tmp, f"marker_{uid}.ts")
+    main_ts = os.path.join(tmp, f"main_{uid}.ts")
+    v_bsf = "h264_mp4toannexb" if video_codec == "h264" else "hevc_mp4toannexb"
+    try:
+        # remux both fragments into MPEG-TS with the required bitstream filter
+        for src, dst in ((marker_path, marker_ts), (input_path, main_ts)):
+            cmd = [
+                "ffmpeg", "-y",
+                "-i", src,
+                "-c", "copy",
+                "-bsf:v", v_bsf,
+                *thread_args,
+                "-f", "mpegts",
+                dst
+            ]
+            # Full-source remux: too expensive to ever execute twice.
+            _run_ffmpeg(cmd, retry_with_capture=False)
+
+        final_cmd = [
+            "ffmpeg", "-y",
+            "-i", f"concat:{marker_ts}|{main_ts}",
+            "-c", "copy",
+            *thread_args
+        ]
+        # if outputting to mp4 and AAC audio is present, apply a filter for correct packaging
+        if output_path.lower().endswith(".mp4"):
+            final_cmd += ["-bsf:a", "aac_adtstoasc"]
+        final_cmd.append(output_path)
+        _run_ffmpeg(final_cmd, retry_with_capture=False)
+    finally:
+        for p in (marker_ts, main_ts):
+            if os.path.exists(p):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+
 
 def mark_video(
     input_path: str,
     output_path: str = None,
     resolution: Tuple[int, int] = None,
     overlay_text: str = None,
+    threads: int = None,
+    probe: dict = None,
 ) -> None:
     """
     Prepend a 0.5-second marker (black frame + filename text) to an existing video,
@@ -35,6 +113,11 @@ def mark_video(
         input_path (str): path to source video file.
         output_path (str, optional): path to result video.
         resolution (tuple, optional): override (width, height). By default taken from input.
+        threads (int, optional): cap on ffmpeg's internal thread count, useful
+                                 when many files are processed in parallel.
+        probe (dict, optional): pre-fetched ffprobe data for the input (as
+                                returned by `io.batch_probe`); skips the
+                                internal probe when provided.
 
     Raises:
         InputFileNotFoundError: If the input file does not exist.
@@ -71,15 +154,15 @@ def mark_video(
             str(output_p), f"Could not create parent directory: {e}"
         ) from e
         
-    marker_container = None
-    marker_ts = None
-    main_ts = None
+    marker_path = None
+    concat_list = None
 
     try:
-        try:
-            probe = _ffprobe_param(input_path)
-        except FFmpegProcessError as e:
-            raise VideoMarkingError("Failed to probe video parameters.") from e
+        if probe is None:
+            try:
+                probe = _ffprobe_param(input_path)
+            except FFmpegProcessError as e:
+                raise VideoMarkingError("Failed to probe video parameters.") from e
         
         streams = probe.get("streams", [])
         if not streams:
@@ -115,13 +198,13 @@ def mark_video(
         # unique temporary files
         tmp = tempfile.gettempdir()
         uid = uuid.uuid4().hex
-        marker_container = os.path.join(tmp, f"marker_{uid}.mp4")
-        marker_ts = os.path.join(tmp, f"marker_{uid}.ts")
-        main_ts = os.path.join(tmp, f"main_{uid}.ts")
+        marker_path = os.path.join(tmp, f"marker_{uid}.mp4")
+        concat_list = os.path.join(tmp, f"concat_{uid}.txt")
 
         if overlay_text is None:
             overlay_text = "Filename: " + os.path.basename(input_path)
-        video_encoder = "libx264" if video_codec == "h264" else "libx265"
+        video_encoder = _select_encoder(video_codec)
+        thread_args = ["-threads", str(threads)] if threads else []
 
         lavfi_src = _generate_lavfi_drawtext(overlay_text, (width, height), 0.5)
         # create the marker: video + silent audio (so that the concatenated file has an audio stream if the original does)
@@ -134,38 +217,46 @@ def mark_video(
             "-pix_fmt", "yuv420p",  # compatible, sufficient for the marker
             "-r", fps,
             "-c:a", "aac", "-ar", "44100",
-            marker_container
+            *thread_args,
+            "-movflags", "+faststart",
+            marker_path
         ]
-        subprocess.run(cmd_marker, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
-
-        # remux both fragments into MPEG-TS with the required bitstream filter
-        v_bsf = "h264_mp4toannexb" if video_codec == "h264" else "hevc_mp4toannexb"
-        for src, dst in ((marker_container, marker_ts), (input_path, main_ts)):
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", src,
-                "-c", "copy",
-                "-bsf:v", v_bsf,
-                "-f", "mpegts",
-                dst
-            ]
-            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+        try:
+            _run_ffmpeg(cmd_marker, retry_with_capture=False)
+        except FFmpegProcessError:
+            if video_encoder not in _HW_ENCODERS.get(video_codec, ()):
+                raise
+            # Compiled-in hardware encoder that does not actually work here;
+            # blacklist it for the rest of the run and redo in software.
+            _broken_encoders.add(video_encoder)
+            cmd_marker[cmd_marker.index("-c:v") + 1] = _SW_ENCODERS[video_codec]
+            _run_ffmpeg(cmd_marker)
 
-        # final concat
-        concat_input = f"concat:{marker_ts}|{main_ts}"
+        # final concat via the demuxer, which reads the original exactly once.
+        # With the marker in the same container family as the source there is
+        # no MPEG-TS detour at all: no Annex B conversion, no ADTS audio to
+        # repackage, and no full-size intermediate written to disk.
+        with open(concat_list, "w", encoding="utf-8") as f:
+            for src in (marker_path, os.path.abspath(input_path)):
+                escaped_src = src.replace("'", "'\\''")
+                f.write(f"file '{escaped_src}'\n")
         final_cmd = [
             "ffmpeg", "-y",
-            "-i", concat_input,
-            "-c", "copy"
+            "-f", "concat", "-safe", "0",
+            "-i", concat_list,
+            "-c", "copy",
+            *thread_args,
+            str(output_p)
         ]
-        # if outputting to mp4 and AAC audio is present, apply a filter for correct packaging
-        if str(output_p).lower().endswith(".mp4"):
-            final_cmd += ["-bsf:a", "aac_adtstoasc"]
-        final_cmd.append(str(output_p))
-        subprocess.run(final_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+        try:
+            # Failure here is control flow (it triggers the TS fallback) and
+            # the command stream-copies the whole source, so never retry it.
+            _run_ffmpeg(final_cmd, retry_with_capture=False)
+        except FFmpegProcessError:
+            # Some sources (odd timebases, edit lists) refuse the direct
+            # concat; redo it through the historic MPEG-TS route.
+            _concat_via_mpegts(input_path, marker_path, str(output_p), video_codec, thread_args)
 
-    except subprocess.CalledProcessError as e:
-        raise FFmpegProcessError(command=e.cmd, stderr=e.stderr.decode('utf-8', 'ignore')) from e
     except (VideoMarkingError, InvalidMediaError, FFmpegNotFoundError):
         raise
     except Exception as e:
@@ -173,7 +264,7 @@ def mark_video(
             raise
         raise VideoMarkingError(f"An unexpected error occurred during marking: {e}") from e
     finally:
-        for p in (marker_container, marker_ts, main_ts):
+        for p in (marker_path, concat_list):
             if p and os.path.exists(p):
                 try:
                     os.remove(p)
@@ -1,4 +1,6 @@
+import functools
 import json
+import os
 import subprocess
 import textwrap
 from typing import Tuple, Optional
@@ -36,7 +38,76 @@ def _ffprobe_param(input_path: str) -> dict:
     """
     Run ffprobe to extract a single stream parameter.
     entry: e.g. 'width', 'height', 'r_frame_rate'
+
+    Results are memoized on (path, mtime, size), so probing the same
+    unchanged file again skips the ffprobe subprocess.
+    """
+    try:
+        stat = os.stat(input_path)
+    except OSError:
+        # Let ffprobe itself report the problem, uncached.
+        return _run_ffprobe(input_path)
+    return _ffprobe_cached(input_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _ffprobe_cached(input_path: str, mtime_ns: int, size: int) -> dict:
+    return _run_ffprobe(input_path)
+
+
+def _run_ffmpeg(cmd, retry_with_capture: bool = True) -> None:
     """
+    Run an ffmpeg command with stdout and stderr fully discarded, so the
+    happy path allocates no OS pipes at all. On failure the command is
+    re-run once with output captured, so the raised FFmpegProcessError
+    still carries ffmpeg's own error message.
+
+    Call sites that treat failure as control flow, or whose command is too
+    expensive to ever run twice (e.g. a full stream copy of the source),
+    pass ``retry_with_capture=False``: stderr is then captured on the one
+    and only run, trading a pipe allocation for never re-executing.
+    """
+    if not retry_with_capture:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            raise FFmpegProcessError(command=list(cmd), stderr=result.stderr)
+        return
+    try:
+        subprocess.run(
+            cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    except subprocess.CalledProcessError as e:
+        retry = subprocess.run(cmd, capture_output=True, text=True)
+        if retry.returncode == 0:
+            return  # transient failure; the retry produced the output
+        raise FFmpegProcessError(command=list(cmd), stderr=retry.stderr) from e
+
+
+@functools.lru_cache(maxsize=1)
+def _available_encoders() -> frozenset:
+    """
+    Return the set of encoder names supported by the ffmpeg build in PATH.
+
+    Queried lazily, once per process. If ffmpeg is missing or the query
+    fails, an empty set is returned so callers fall back to their defaults.
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-encoders"]
+    try:
+        result = subprocess.run(
+            cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+    encoders = set()
+    # Listing format: " V....D libx264    H.264 / ..." after a header block.
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[0][:1] in ("V", "A", "S") and set(parts[0]) <= set("VASFXBD."):
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+def _run_ffprobe(input_path: str) -> dict:
     cmd = [
         "ffprobe", "-v", "error",
         "-select_streams", "v:0",